@@ -14,14 +14,25 @@ Versão: 2.0.0
 # 📦 IMPORTAÇÕES E CONFIGURAÇÕES
 # =============================================================================
 
-from flask import Flask, request, jsonify, render_template_string
+from __future__ import annotations
+
+from flask import Flask, Response, request
 import joblib
 import numpy as np
-import pandas as pd
+import xgboost as xgb
 import os
 import logging
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import threading
+import time
+import bisect
+from collections import OrderedDict
 from datetime import datetime
 import json
+import hashlib
+import orjson
 from typing import Dict, List, Tuple, Optional
 
 # Tentar importar flask_cors, se não existir, continuar sem CORS
@@ -33,6 +44,20 @@ except ImportError:
     print("⚠️ flask_cors não instalado. CORS não será habilitado.")
     print("💡 Para instalar: pip install flask-cors")
 
+# Tentar importar treelite (>= 4) e tl2cgen, se não existirem, usar o preditor do próprio XGBoost
+try:
+    import treelite
+    TREELITE_AVAILABLE = hasattr(treelite, 'frontend')
+    if not TREELITE_AVAILABLE:
+        print(f"⚠️ treelite {treelite.__version__} não suportado (requer >= 4). Usando o preditor do XGBoost.")
+    import tl2cgen
+except ImportError as e:
+    if 'treelite' in globals():
+        # treelite presente, mas sem o tl2cgen não há como compilar o modelo
+        print(f"⚠️ treelite instalado, mas tl2cgen indisponível ({e}). Usando o preditor do XGBoost.")
+        print("💡 Para instalar: pip install tl2cgen")
+    TREELITE_AVAILABLE = False
+
 # =============================================================================
 # 📁 CRIAÇÃO DE DIRETÓRIOS NECESSÁRIOS
 # =============================================================================
@@ -58,6 +83,45 @@ create_directories()
 # ⚙️ CONFIGURAÇÃO DO LOGGING
 # =============================================================================
 
+# Tamanho máximo da fila de registros de log (registros excedentes são descartados)
+LOG_QUEUE_MAXSIZE = 10000
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler que descarta o registro em vez de bloquear quando a fila está cheia"""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+# Handlers reais (console/arquivo), executados pela thread do QueueListener
+_log_handlers = []
+_queue_handler = _NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_MAXSIZE))
+_log_listener = None
+_log_listener_pid = None
+
+def start_log_listener():
+    """Inicia (uma vez por processo) a thread que grava os registros enfileirados"""
+    global _log_listener, _log_listener_pid
+    if _log_listener_pid == os.getpid() or not _log_handlers:
+        return
+    
+    # Após um fork, a fila herdada do processo pai é substituída por uma nova
+    if _log_listener_pid is not None:
+        _queue_handler.queue = queue.Queue(LOG_QUEUE_MAXSIZE)
+    
+    _log_listener = QueueListener(_queue_handler.queue, *_log_handlers, respect_handler_level=True)
+    _log_listener.start()
+    _log_listener_pid = os.getpid()
+
+def stop_log_listener():
+    """Grava os registros pendentes e encerra a thread de logging"""
+    if _log_listener is not None and _log_listener_pid == os.getpid():
+        _log_listener.stop()
+
+atexit.register(stop_log_listener)
+
 def setup_logging():
     """Configura o sistema de logging de forma robusta"""
     try:
@@ -85,11 +149,15 @@ def setup_logging():
             except Exception as e:
                 continue
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=log_handlers
-        )
+        # Gravação assíncrona: a requisição apenas enfileira o registro
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        for handler in log_handlers:
+            handler.setFormatter(formatter)
+        _log_handlers.extend(log_handlers)
+        _queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+        start_log_listener()
         
         return True
         
@@ -115,12 +183,25 @@ if CORS_AVAILABLE:
 
 # Configurações da aplicação
 app.config['JSON_SORT_KEYS'] = False
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+
+# Constantes reutilizadas nas respostas
+API_VERSION = '2.0.0'
+ENDPOINTS_DISPONIVEIS = ['/', '/health', '/predict', '/test', '/test/fraud', '/info']
+
+def ojsonify(obj) -> Response:
+    """Serializa a resposta JSON com orjson (escalares numpy suportados nativamente)"""
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+                              mimetype='application/json')
 
 # =============================================================================
 # 📊 CARREGAMENTO DOS MODELOS E ARTEFATOS
 # =============================================================================
 
+# Campos de entrada esperados em /predict
+_V_KEYS = tuple(f'V{i}' for i in range(1, 29))
+_REQUIRED_FIELDS = _V_KEYS + ('Amount',)
+
 class ModelManager:
     """Gerenciador dos modelos e artefatos do ML"""
     
@@ -130,6 +211,19 @@ class ModelManager:
         self.feature_names = None
         self.metadata = None
         self.model_loaded = False
+        self.model_dir = None
+        self.model_etag = None
+        self.predictor = None
+        self._booster = None
+        self._iteration_range = (0, 0)
+        # Resultado da última predição de teste (atualizado em segundo plano)
+        self.last_probe_ok = None
+        self.last_probe_ts = None
+        self.last_probe_error = None
+        self._last_probe_monotonic = None
+        # Parâmetros do scaler do Amount (média e inverso do desvio padrão)
+        self._amt_mean = 0.0
+        self._amt_inv_scale = 1.0
         
     def load_models(self):
         """Carrega todos os artefatos necessários"""
@@ -137,25 +231,30 @@ class ModelManager:
             # Caminhos dos modelos (tentar múltiplas localizações)
             base_paths = ['models/', '../models/', './']
             
+            # Formatos nativos (UBJ/NPZ/JSON) têm prioridade sobre os pickles
             model_files = {
-                'modelo': 'modelo_fraude.pkl',
-                'scaler': 'scaler_amount.pkl',
-                'features': 'feature_names.pkl',
-                'metadata': 'modelo_metadata.pkl'
+                'modelo': ['modelo_fraude.ubj', 'modelo_fraude.pkl'],
+                'scaler': ['scaler_amount.npz', 'scaler_amount.pkl'],
+                'features': ['feature_names.json', 'feature_names.pkl'],
+                'metadata': ['modelo_metadata.json', 'modelo_metadata.pkl']
             }
             
             # Encontrar o caminho correto dos modelos
             model_paths = {}
-            for model_name, filename in model_files.items():
+            for model_name, filenames in model_files.items():
                 found = False
-                for base_path in base_paths:
-                    full_path = os.path.join(base_path, filename)
-                    if os.path.exists(full_path):
-                        model_paths[model_name] = full_path
-                        found = True
+                for filename in filenames:
+                    for base_path in base_paths:
+                        full_path = os.path.join(base_path, filename)
+                        if os.path.exists(full_path):
+                            model_paths[model_name] = full_path
+                            found = True
+                            break
+                    if found:
                         break
                 
                 if not found:
+                    filename = filenames[-1]
                     # Tentar com scaler alternativo se não encontrar o metadata
                     if model_name == 'metadata':
                         logger.warning(f"⚠️ Arquivo {filename} não encontrado - continuando sem metadados")
@@ -173,11 +272,38 @@ class ModelManager:
             logger.info("🔄 Carregando modelos...")
             
             # Modelo principal (obrigatório)
-            self.modelo = joblib.load(model_paths['modelo'])
-            logger.info("✅ Modelo principal carregado")
+            if model_paths['modelo'].endswith('.ubj'):
+                self.modelo = xgb.XGBClassifier()
+                self.modelo.load_model(model_paths['modelo'])
+            else:
+                self.modelo = joblib.load(model_paths['modelo'])
+            self.model_dir = os.path.dirname(model_paths['modelo'])
+            logger.info(f"✅ Modelo principal carregado ({model_paths['modelo']})")
+            
+            # Modelos XGBoost usam o Booster diretamente; outros estimadores, o predict_proba
+            if isinstance(self.modelo, xgb.XGBClassifier):
+                self._booster = self.modelo.get_booster()
+                # Respeitar a melhor iteração quando o treino usou early stopping
+                best_iteration = getattr(self.modelo, 'best_iteration', None)
+                self._iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+            else:
+                self._booster = None
+                logger.warning("⚠️ Modelo não é um XGBClassifier - usando predict_proba")
+            
+            # Preditor compilado (opcional)
+            self.predictor = None
+            if TREELITE_AVAILABLE and self._booster is not None:
+                self._compile_predictor(model_paths['modelo'])
             
             # Scaler (criar um temporário se não existir)
-            if model_paths['scaler']:
+            if model_paths['scaler'] and model_paths['scaler'].endswith('.npz'):
+                # Apenas os parâmetros do scaler são necessários
+                self.scaler = None
+                with np.load(model_paths['scaler']) as params:
+                    amount_mean = float(params['mean'][0])
+                    amount_scale = float(params['scale'][0])
+                logger.info("✅ Scaler carregado")
+            elif model_paths['scaler']:
                 self.scaler = joblib.load(model_paths['scaler'])
                 logger.info("✅ Scaler carregado")
             else:
@@ -188,8 +314,20 @@ class ModelManager:
                 self.scaler.fit(amount_sample)
                 logger.info("⚠️ Scaler temporário criado")
             
+            if self.scaler is not None:
+                amount_mean = float(self.scaler.mean_[0])
+                amount_scale = float(self.scaler.scale_[0])
+            
+            # Cachear parâmetros do scaler para normalizar o Amount sem passar pelo sklearn
+            self._amt_mean = amount_mean
+            self._amt_inv_scale = 1.0 / amount_scale
+            
             # Features (tentar carregar ou criar padrão)
-            if model_paths['features']:
+            if model_paths['features'] and model_paths['features'].endswith('.json'):
+                with open(model_paths['features'], encoding='utf-8') as f:
+                    self.feature_names = json.load(f)
+                logger.info("✅ Feature names carregadas")
+            elif model_paths['features']:
                 self.feature_names = joblib.load(model_paths['features'])
                 logger.info("✅ Feature names carregadas")
             else:
@@ -198,7 +336,11 @@ class ModelManager:
                 logger.info("⚠️ Feature names padrão criadas")
             
             # Metadata (opcional)
-            if model_paths['metadata']:
+            if model_paths['metadata'] and model_paths['metadata'].endswith('.json'):
+                with open(model_paths['metadata'], encoding='utf-8') as f:
+                    self.metadata = json.load(f)
+                logger.info("✅ Metadados carregados")
+            elif model_paths['metadata']:
                 self.metadata = joblib.load(model_paths['metadata'])
                 logger.info("✅ Metadados carregados")
             else:
@@ -210,6 +352,17 @@ class ModelManager:
                 }
                 logger.info("⚠️ Metadados padrão criados")
             
+            # ETag das respostas estáticas (/ e /info), derivada da versão da API,
+            # do modelo e dos artefatos exibidos (metadados e nomes das features)
+            etag_hash = hashlib.sha256(API_VERSION.encode())
+            with open(model_paths['modelo'], 'rb') as f:
+                etag_hash.update(f.read(1 << 20))
+            for artifact in ('features', 'metadata'):
+                if model_paths[artifact]:
+                    with open(model_paths[artifact], 'rb') as f:
+                        etag_hash.update(f.read())
+            self.model_etag = etag_hash.hexdigest()[:16]
+            
             self.model_loaded = True
             logger.info("✅ Todos os modelos carregados com sucesso!")
             
@@ -225,118 +378,386 @@ class ModelManager:
             self.model_loaded = False
             return False
     
-    def validate_input(self, dados: Dict) -> Tuple[bool, str]:
-        """Valida os dados de entrada"""
-        required_fields = [f'V{i}' for i in range(1, 29)] + ['Amount']
+    def _compile_predictor(self, model_path: str):
+        """Compila o modelo com Treelite/tl2cgen em uma biblioteca nativa e carrega o preditor"""
+        lib_path = os.path.join(self.model_dir, 'modelo_fraude.so')
+        try:
+            # Recompilar apenas se a biblioteca não existir ou estiver desatualizada
+            if not os.path.exists(lib_path) or os.path.getmtime(lib_path) < os.path.getmtime(model_path):
+                logger.info("🔧 Compilando modelo com Treelite...")
+                # Compilar apenas as árvores usadas pelo XGBoost (melhor iteração, se houver)
+                booster = self._booster
+                if self._iteration_range != (0, 0):
+                    booster = booster[self._iteration_range[0]:self._iteration_range[1]]
+                tl_model = treelite.frontend.from_xgboost(booster)
+                tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=lib_path,
+                                   params={'parallel_comp': 1})
+            
+            self.predictor = tl2cgen.Predictor(lib_path)
+            logger.info(f"✅ Preditor Treelite carregado ({lib_path})")
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao compilar modelo com Treelite - usando XGBoost: {str(e)}")
+            self.predictor = None
+    
+    def predict_batch(self, entrada: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Retorna as classes previstas e as probabilidades de fraude de um lote"""
+        # Uma única chamada de margem bruta substitui predict + predict_proba
+        if self.predictor is not None:
+            margens = self.predictor.predict(tl2cgen.DMatrix(entrada), pred_margin=True)
+        elif self._booster is not None:
+            # inplace_predict lê o float32 diretamente, sem DMatrix nem cópia em float64
+            margens = self._booster.inplace_predict(
+                entrada, iteration_range=self._iteration_range, predict_type='margin')
+        else:
+            prob_fraude = self.modelo.predict_proba(entrada)[:, 1]
+            return (prob_fraude > 0.5).astype(np.int64), prob_fraude
         
-        # Verificar campos obrigatórios
-        missing_fields = [field for field in required_fields if field not in dados]
-        if missing_fields:
-            return False, f"Campos obrigatórios não encontrados: {missing_fields}"
+        prob_fraude = 1.0 / (1.0 + np.exp(-np.ravel(margens)))
+        return (prob_fraude > 0.5).astype(np.int64), prob_fraude
+    
+    def predict(self, entrada: np.ndarray) -> Tuple[int, float]:
+        """Retorna a classe prevista e a probabilidade de fraude de uma transação"""
+        resultados, prob_fraude = self.predict_batch(entrada)
+        return int(resultados[0]), float(prob_fraude[0])
+    
+    def probe(self) -> bool:
+        """Executa uma predição de teste e registra o resultado"""
+        try:
+            test_data = np.zeros((1, len(self.feature_names)), dtype=np.float32)
+            self.predict(test_data)
+            self.last_probe_ok = True
+            self.last_probe_error = None
+        except Exception as e:
+            logger.error(f"Erro na predição de teste: {str(e)}")
+            self.last_probe_ok = False
+            self.last_probe_error = str(e)
         
-        # Verificar tipos de dados
-        for field in required_fields:
+        self.last_probe_ts = datetime.now().isoformat()
+        self._last_probe_monotonic = time.monotonic()
+        return self.last_probe_ok
+    
+    def probe_age(self) -> Optional[float]:
+        """Segundos desde a última predição de teste (None se nunca executada)"""
+        if self._last_probe_monotonic is None:
+            return None
+        return time.monotonic() - self._last_probe_monotonic
+    
+    def export_artifacts(self, output_dir: Optional[str] = None) -> List[str]:
+        """Exporta os artefatos carregados para formatos nativos (UBJ/NPZ/JSON)"""
+        output_dir = output_dir or self.model_dir or 'models'
+        os.makedirs(output_dir, exist_ok=True)
+        exported = []
+        
+        # Modelo no formato binário nativo do XGBoost
+        model_path = os.path.join(output_dir, 'modelo_fraude.ubj')
+        self.modelo.save_model(model_path)
+        exported.append(model_path)
+        
+        # Parâmetros do scaler do Amount
+        scaler_path = os.path.join(output_dir, 'scaler_amount.npz')
+        np.savez(scaler_path,
+                 mean=np.array([self._amt_mean]),
+                 scale=np.array([1.0 / self._amt_inv_scale]))
+        exported.append(scaler_path)
+        
+        # Nomes das features e metadados
+        features_path = os.path.join(output_dir, 'feature_names.json')
+        with open(features_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self.feature_names), f, ensure_ascii=False)
+        exported.append(features_path)
+        
+        metadata_path = os.path.join(output_dir, 'modelo_metadata.json')
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            # Escalares numpy (ex.: métricas) são convertidos para tipos nativos
+            json.dump(self.metadata, f, ensure_ascii=False, indent=2,
+                      default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+        exported.append(metadata_path)
+        
+        return exported
+    
+    @staticmethod
+    def _find_invalid_field(dados: Dict) -> Optional[str]:
+        """Retorna o primeiro campo que não pode ser convertido para número"""
+        for campo in _REQUIRED_FIELDS:
             try:
-                float(dados[field])
+                float(dados[campo])
             except (ValueError, TypeError):
-                return False, f"Campo '{field}' deve ser um número válido"
+                return campo
+        return None
+    
+    def parse_and_featurize(self, dados: Dict) -> np.ndarray:
+        """Valida os dados de entrada e monta o vetor de features em uma única passagem"""
+        if not isinstance(dados, dict):
+            raise ValueError("Os dados devem ser um objeto JSON")
         
-        # Verificar ranges válidos
-        if dados['Amount'] < 0:
-            return False, "Amount deve ser maior ou igual a zero"
+        try:
+            # V1 a V28 e Amount em um único laço em C (a conversão numérica valida o tipo)
+            entrada = np.fromiter(map(dados.__getitem__, _REQUIRED_FIELDS),
+                                  dtype=np.float32, count=len(_REQUIRED_FIELDS))
+            amount = float(dados['Amount'])
+        except KeyError:
+            missing_fields = [field for field in _REQUIRED_FIELDS if field not in dados]
+            raise ValueError(f"Campos obrigatórios não encontrados: {missing_fields}")
+        except (ValueError, TypeError):
+            campo = self._find_invalid_field(dados) or 'Amount'
+            raise ValueError(f"Campo '{campo}' deve ser um número válido")
         
-        return True, "Dados válidos"
-    
-    def preprocess_data(self, dados: Dict) -> np.ndarray:
-        """Preprocessa os dados para predição"""
-        features = []
+        # O fromiter converte null em NaN: confirmar campo a campo apenas nesse caso
+        if np.isnan(entrada).any():
+            campo = self._find_invalid_field(dados)
+            if campo:
+                raise ValueError(f"Campo '{campo}' deve ser um número válido")
         
-        # Adicionar features V1 a V28
-        for i in range(1, 29):
-            features.append(float(dados[f'V{i}']))
+        # Verificar ranges válidos
+        if amount < 0:
+            raise ValueError("Amount deve ser maior ou igual a zero")
         
-        # Normalizar Amount e adicionar
-        amount_normalized = self.scaler.transform([[float(dados['Amount'])]])[0][0]
-        features.append(amount_normalized)
+        # Normalizar Amount no lugar (transformação afim equivalente ao StandardScaler)
+        entrada[28] = (amount - self._amt_mean) * self._amt_inv_scale
         
-        return np.array([features])
+        return entrada.reshape(1, -1)
 
 # Instância global do gerenciador
 model_manager = ModelManager()
 
 # =============================================================================
-# 🏠 ROTA PRINCIPAL E DOCUMENTAÇÃO
+# 📦 MICRO-BATCHING DAS PREDIÇÕES
 # =============================================================================
 
-@app.route('/')
-def home():
-    """Página principal com documentação da API"""
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>🔐 API de Detecção de Fraudes</title>
-        <meta charset="UTF-8">
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
-            .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-            .header { text-align: center; color: #2c3e50; margin-bottom: 30px; }
-            .status { padding: 10px; border-radius: 5px; margin: 20px 0; }
-            .status.success { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
-            .status.error { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
-            .endpoint { background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #007bff; }
-            .method { background: #28a745; color: white; padding: 2px 8px; border-radius: 3px; font-size: 12px; }
-            .method.get { background: #17a2b8; }
-            code { background: #f4f4f4; padding: 2px 5px; border-radius: 3px; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔐 API de Detecção de Fraudes v2.0.0</h1>
-                <p>Sistema de Machine Learning para detecção de fraudes em cartões de crédito</p>
-            </div>
-            
-            <div class="status {{ status_class }}">
-                <strong>Status do Sistema:</strong> {{ status_message }}
-            </div>
-            
-            <h2>📋 Endpoints Disponíveis</h2>
-            
-            <div class="endpoint">
-                <h3><span class="method get">GET</span> /</h3>
-                <p>Página principal com documentação da API</p>
-            </div>
-            
-            <div class="endpoint">
-                <h3><span class="method get">GET</span> /health</h3>
-                <p>Verificação de saúde da API e do modelo</p>
-            </div>
-            
-            <div class="endpoint">
-                <h3><span class="method">POST</span> /predict</h3>
-                <p>Realiza predição de fraude para uma transação</p>
-                <p><strong>Entrada:</strong> JSON com campos V1-V28 e Amount</p>
-                <p><strong>Saída:</strong> Resultado da predição e probabilidade</p>
-            </div>
+# Tamanho máximo do lote (acompanha o número de threads por worker do Gunicorn, que
+# limita as requisições simultâneas) e tempo máximo de espera para completá-lo quando
+# há concorrência (0: despachar apenas o que já está na fila, sem janela de espera)
+MAX_BATCH = int(os.environ.get('GUNICORN_THREADS', 8))
+MAX_WAIT_MS = 0
+# Tempo máximo que uma requisição aguarda o resultado do lote
+BATCH_TIMEOUT_S = 5.0
+
+class _PendingPrediction:
+    """Predição enfileirada aguardando o processamento do lote"""
+    
+    __slots__ = ('features', 'event', 'result')
+    
+    def __init__(self, features: np.ndarray):
+        self.features = features
+        self.event = threading.Event()
+        self.result = None
+
+class BatchPredictor:
+    """Agrupa predições concorrentes em uma única chamada ao modelo"""
+    
+    def __init__(self, manager: ModelManager, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.manager = manager
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.fila = queue.Queue()
+        self.thread = None
+    
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+    
+    def start(self):
+        """Inicia a thread que processa os lotes"""
+        if self.running:
+            return
+        self.thread = threading.Thread(target=self._worker, name='batch-predictor', daemon=True)
+        self.thread.start()
+    
+    def predict(self, entrada: np.ndarray) -> Tuple[int, float]:
+        """Enfileira uma transação e aguarda o resultado do lote"""
+        # Sem a thread de lotes, predizer diretamente
+        if not self.running:
+            return self.manager.predict(entrada)
+        
+        pendente = _PendingPrediction(entrada[0])
+        self.fila.put(pendente)
+        if not pendente.event.wait(BATCH_TIMEOUT_S):
+            raise TimeoutError("Tempo limite excedido aguardando a predição")
+        
+        if isinstance(pendente.result, Exception):
+            raise pendente.result
+        return pendente.result
+    
+    def _worker(self):
+        """Drena a fila em lotes de até max_batch itens"""
+        # Buffer denso e contíguo (float32, linha a linha como os preditores percorrem
+        # as árvores), alocado uma vez e reaproveitado em todos os lotes
+        lote = None
+        while True:
+            pendentes = [self.fila.get()]
             
-            <div class="endpoint">
-                <h3><span class="method get">GET</span> /test</h3>
-                <p>Teste com dados fictícios (transação normal)</p>
-            </div>
+            # Drenar apenas o que já está na fila: uma requisição isolada é despachada na hora
+            while len(pendentes) < self.max_batch:
+                try:
+                    pendentes.append(self.fila.get_nowait())
+                except queue.Empty:
+                    break
             
-            <div class="endpoint">
-                <h3><span class="method get">GET</span> /test/fraud</h3>
-                <p>Teste com dados fictícios (transação fraudulenta)</p>
-            </div>
+            # Com outras requisições já enfileiradas (concorrência), aguardar a janela
+            # para completar o lote
+            if 1 < len(pendentes) < self.max_batch and self.max_wait > 0:
+                prazo = time.monotonic() + self.max_wait
+                while len(pendentes) < self.max_batch:
+                    restante = prazo - time.monotonic()
+                    if restante <= 0:
+                        break
+                    try:
+                        pendentes.append(self.fila.get(timeout=restante))
+                    except queue.Empty:
+                        break
             
-            <div class="endpoint">
-                <h3><span class="method get">GET</span> /info</h3>
-                <p>Informações detalhadas sobre o modelo</p>
-            </div>
+            try:
+                n_features = pendentes[0].features.shape[0]
+                if lote is None or lote.shape != (self.max_batch, n_features):
+                    lote = np.empty((self.max_batch, n_features), dtype=np.float32)
+                for i, pendente in enumerate(pendentes):
+                    lote[i] = pendente.features
+                
+                resultados, prob_fraude = self.manager.predict_batch(lote[:len(pendentes)])
+                for i, pendente in enumerate(pendentes):
+                    pendente.result = (int(resultados[i]), float(prob_fraude[i]))
+            except Exception as e:
+                logger.error(f"Erro na predição em lote: {str(e)}")
+                for pendente in pendentes:
+                    pendente.result = e
+            finally:
+                for pendente in pendentes:
+                    pendente.event.set()
+
+# Instância global do preditor em lotes
+batch_predictor = BatchPredictor(model_manager)
+
+# =============================================================================
+# 🗃️ CACHE DAS PREDIÇÕES
+# =============================================================================
+
+# Capacidade e tempo de vida das entradas do cache
+CACHE_MAXSIZE = 4096
+CACHE_TTL_S = 300.0
+# Probabilidades nesta faixa são incertas demais para serem reaproveitadas
+CACHE_FAIXA_INCERTEZA = (0.4, 0.6)
+
+class PredictionCache:
+    """Cache LRU com expiração (TTL) das predições, indexado pelos bytes das features"""
+    
+    def __init__(self, maxsize: int = CACHE_MAXSIZE, ttl: float = CACHE_TTL_S):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, chave: bytes) -> Optional[Tuple[int, float]]:
+        """Retorna a predição cacheada ou None se ausente/expirada"""
+        with self._lock:
+            item = self._entradas.get(chave)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._entradas[chave]
+                self.misses += 1
+                return None
             
-            <h2>🧪 Exemplo de Uso</h2>
-            <pre><code>curl -X POST http://localhost:5000/predict \\
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+            return item[1]
+    
+    def put(self, chave: bytes, resultado: Tuple[int, float]):
+        """Armazena uma predição, exceto as que caem na faixa de incerteza"""
+        if CACHE_FAIXA_INCERTEZA[0] <= resultado[1] <= CACHE_FAIXA_INCERTEZA[1]:
+            return
+        
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + self.ttl, resultado)
+            self._entradas.move_to_end(chave)
+            if len(self._entradas) > self.maxsize:
+                self._entradas.popitem(last=False)
+    
+    def stats(self) -> Dict:
+        """Estatísticas de uso do cache"""
+        total = self.hits + self.misses
+        return {
+            'tamanho': len(self._entradas),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0
+        }
+
+# Instância global do cache de predições
+prediction_cache = PredictionCache()
+
+# =============================================================================
+# 🏠 ROTA PRINCIPAL E DOCUMENTAÇÃO
+# =============================================================================
+
+# Template da página principal, compilado uma única vez
+HOME_TEMPLATE_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>🔐 API de Detecção de Fraudes</title>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
+        .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .header { text-align: center; color: #2c3e50; margin-bottom: 30px; }
+        .status { padding: 10px; border-radius: 5px; margin: 20px 0; }
+        .status.success { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
+        .status.error { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
+        .endpoint { background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #007bff; }
+        .method { background: #28a745; color: white; padding: 2px 8px; border-radius: 3px; font-size: 12px; }
+        .method.get { background: #17a2b8; }
+        code { background: #f4f4f4; padding: 2px 5px; border-radius: 3px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🔐 API de Detecção de Fraudes v2.0.0</h1>
+            <p>Sistema de Machine Learning para detecção de fraudes em cartões de crédito</p>
+        </div>
+        
+        <div class="status {{ status_class }}">
+            <strong>Status do Sistema:</strong> {{ status_message }}
+        </div>
+        
+        <h2>📋 Endpoints Disponíveis</h2>
+        
+        <div class="endpoint">
+            <h3><span class="method get">GET</span> /</h3>
+            <p>Página principal com documentação da API</p>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method get">GET</span> /health</h3>
+            <p>Verificação de saúde da API e do modelo</p>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method">POST</span> /predict</h3>
+            <p>Realiza predição de fraude para uma transação</p>
+            <p><strong>Entrada:</strong> JSON com campos V1-V28 e Amount</p>
+            <p><strong>Saída:</strong> Resultado da predição e probabilidade</p>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method get">GET</span> /test</h3>
+            <p>Teste com dados fictícios (transação normal)</p>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method get">GET</span> /test/fraud</h3>
+            <p>Teste com dados fictícios (transação fraudulenta)</p>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method get">GET</span> /info</h3>
+            <p>Informações detalhadas sobre o modelo</p>
+        </div>
+        
+        <h2>🧪 Exemplo de Uso</h2>
+        <pre><code>curl -X POST http://localhost:5000/predict \\
   -H "Content-Type: application/json" \\
   -d '{
     "V1": -1.359807,
@@ -345,19 +766,44 @@ def home():
     "V28": -0.021053,
     "Amount": 149.62
   }'</code></pre>
-            
-            <h2>📊 Informações do Modelo</h2>
-            <ul>
-                <li><strong>Algoritmo:</strong> {{ model_type }}</li>
-                <li><strong>Features:</strong> {{ num_features }}</li>
-                <li><strong>Versão:</strong> {{ model_version }}</li>
-                <li><strong>Treinado em:</strong> {{ train_date }}</li>
-                <li><strong>CORS:</strong> {{ cors_status }}</li>
-            </ul>
-        </div>
-    </body>
-    </html>
-    """
+        
+        <h2>📊 Informações do Modelo</h2>
+        <ul>
+            <li><strong>Algoritmo:</strong> {{ model_type }}</li>
+            <li><strong>Features:</strong> {{ num_features }}</li>
+            <li><strong>Versão:</strong> {{ model_version }}</li>
+            <li><strong>Treinado em:</strong> {{ train_date }}</li>
+            <li><strong>CORS:</strong> {{ cors_status }}</li>
+        </ul>
+    </div>
+</body>
+</html>
+"""
+
+_HOME_TEMPLATE = app.jinja_env.from_string(HOME_TEMPLATE_HTML)
+
+# Cache HTTP das respostas que só mudam com o modelo (/ e /info)
+CACHE_CONTROL_ESTATICO = 'public, max-age=60'
+
+def _with_cache_headers(response: Response) -> Response:
+    """Adiciona ETag e Cache-Control a uma resposta estática"""
+    response.set_etag(model_manager.model_etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL_ESTATICO
+    return response
+
+def _not_modified() -> Optional[Response]:
+    """Retorna 304 se o cliente já possui a versão atual (If-None-Match)"""
+    if model_manager.model_etag and request.if_none_match.contains_weak(model_manager.model_etag):
+        return _with_cache_headers(app.response_class(status=304))
+    return None
+
+@app.route('/')
+def home():
+    """Página principal com documentação da API"""
+    if model_manager.model_loaded:
+        not_modified = _not_modified()
+        if not_modified is not None:
+            return not_modified
     
     # Verificar status do modelo
     if model_manager.model_loaded:
@@ -369,14 +815,17 @@ def home():
         status_message = "❌ Sistema com problemas - Modelo não carregado"
         model_info = {}
     
-    return render_template_string(html_template,
-                                 status_class=status_class,
-                                 status_message=status_message,
-                                 model_type=model_info.get('modelo_tipo', 'N/A'),
-                                 num_features=model_info.get('numero_features', 'N/A'),
-                                 model_version=model_info.get('versao_modelo', 'N/A'),
-                                 train_date=model_info.get('data_treinamento', 'N/A'),
-                                 cors_status="Habilitado" if CORS_AVAILABLE else "Desabilitado")
+    response = app.response_class(
+        _HOME_TEMPLATE.render(status_class=status_class,
+                              status_message=status_message,
+                              model_type=model_info.get('modelo_tipo', 'N/A'),
+                              num_features=model_info.get('numero_features', 'N/A'),
+                              model_version=model_info.get('versao_modelo', 'N/A'),
+                              train_date=model_info.get('data_treinamento', 'N/A'),
+                              cors_status="Habilitado" if CORS_AVAILABLE else "Desabilitado"),
+        mimetype='text/html')
+    
+    return _with_cache_headers(response) if model_manager.model_loaded else response
 
 # =============================================================================
 # 🏥 ROTA DE HEALTH CHECK
@@ -390,24 +839,32 @@ def health_check():
             'timestamp': datetime.now().isoformat(),
             'api_status': 'healthy',
             'model_loaded': model_manager.model_loaded,
-            'version': '2.0.0',
-            'cors_enabled': CORS_AVAILABLE
+            'version': API_VERSION,
+            'cors_enabled': CORS_AVAILABLE,
+            'cache': prediction_cache.stats()
         }
         
         if model_manager.model_loaded:
-            # Teste rápido do modelo
-            test_data = np.zeros((1, len(model_manager.feature_names)))
-            _ = model_manager.modelo.predict(test_data)
-            status['model_status'] = 'healthy'
+            # Resultado da predição de teste em segundo plano; executada aqui se a thread
+            # não estiver rodando ou se o último resultado estiver desatualizado
+            probe_age = model_manager.probe_age()
+            probe_thread_alive = _probe_thread is not None and _probe_thread.is_alive()
+            if not probe_thread_alive or probe_age is None or probe_age > 2 * HEALTH_PROBE_INTERVAL_S:
+                model_manager.probe()
+            status['model_status'] = 'healthy' if model_manager.last_probe_ok else 'error'
+            status['last_probe'] = model_manager.last_probe_ts
+            if not model_manager.last_probe_ok:
+                status['api_status'] = 'degraded'
+                status['error'] = model_manager.last_probe_error
         else:
             status['model_status'] = 'error'
             status['api_status'] = 'degraded'
         
-        return jsonify(status), 200 if status['api_status'] == 'healthy' else 503
+        return ojsonify(status), 200 if status['api_status'] == 'healthy' else 503
         
     except Exception as e:
         logger.error(f"Erro no health check: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'timestamp': datetime.now().isoformat(),
             'api_status': 'error',
             'model_status': 'error',
@@ -418,103 +875,105 @@ def health_check():
 # 🔮 ROTA DE PREDIÇÃO PRINCIPAL
 # =============================================================================
 
+# Limites dos níveis de risco e da confiança da recomendação
+_RISK_BINS = (0.2, 0.4, 0.6, 0.8)
+_RISK_LABELS = ('MUITO_BAIXO', 'BAIXO', 'MEDIO', 'ALTO', 'MUITO_ALTO')
+_CONFIANCA_BINS = (0.2, 0.8)
+_CONFIANCA_LABELS = ('ALTA', 'MEDIA', 'ALTA')
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """Realiza predição de fraude para uma transação"""
-    start_time = datetime.now()
+    t0 = time.perf_counter_ns()
+    # Timestamp materializado uma única vez e reutilizado nas respostas de erro
+    timestamp = datetime.now().isoformat()
     
     try:
         # Verificar se o modelo está carregado
         if not model_manager.model_loaded:
-            return jsonify({
+            return ojsonify({
                 'erro': 'Modelo não carregado',
                 'status': 'ERROR',
-                'timestamp': start_time.isoformat()
+                'timestamp': timestamp
             }), 503
         
         # Obter dados da requisição
-        dados = request.get_json(force=True)
+        raw_data = request.get_data(cache=False)
+        try:
+            dados = orjson.loads(raw_data) if raw_data else None
+        except orjson.JSONDecodeError:
+            return ojsonify({
+                'erro': 'JSON inválido',
+                'status': 'ERROR',
+                'timestamp': timestamp
+            }), 400
+        
         if not dados:
-            return jsonify({
+            return ojsonify({
                 'erro': 'Dados JSON não fornecidos',
                 'status': 'ERROR',
-                'timestamp': start_time.isoformat()
+                'timestamp': timestamp
             }), 400
         
-        # Validar dados de entrada
-        is_valid, validation_message = model_manager.validate_input(dados)
-        if not is_valid:
-            return jsonify({
-                'erro': validation_message,
+        # Validar e preprocessar dados
+        try:
+            entrada = model_manager.parse_and_featurize(dados)
+        except ValueError as e:
+            logger.warning("Erro de validação: %s", e)
+            return ojsonify({
+                'erro': str(e),
                 'status': 'VALIDATION_ERROR',
-                'timestamp': start_time.isoformat()
+                'timestamp': timestamp
             }), 400
         
-        # Preprocessar dados
-        entrada = model_manager.preprocess_data(dados)
-        
-        # Fazer predição
-        resultado = model_manager.modelo.predict(entrada)[0]
-        probabilidades = model_manager.modelo.predict_proba(entrada)[0]
-        prob_fraude = probabilidades[1]
+        # Fazer predição (cacheada ou agrupada com as requisições concorrentes)
+        chave = entrada.tobytes()
+        predicao = prediction_cache.get(chave)
+        if predicao is None:
+            predicao = batch_predictor.predict(entrada)
+            prediction_cache.put(chave, predicao)
+        resultado, prob_fraude = predicao
         
         # Determinar nível de risco
-        if prob_fraude >= 0.8:
-            risk_level = "MUITO_ALTO"
-        elif prob_fraude >= 0.6:
-            risk_level = "ALTO"
-        elif prob_fraude >= 0.4:
-            risk_level = "MEDIO"
-        elif prob_fraude >= 0.2:
-            risk_level = "BAIXO"
-        else:
-            risk_level = "MUITO_BAIXO"
+        risk_level = _RISK_LABELS[bisect.bisect_right(_RISK_BINS, prob_fraude)]
         
         # Calcular tempo de processamento
-        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+        processing_time = (time.perf_counter_ns() - t0) / 1e6
         
         # Log da predição
-        logger.info(f"Predição realizada: Resultado={resultado}, Probabilidade={prob_fraude:.4f}, Tempo={processing_time:.2f}ms")
+        logger.info("Predição realizada: Resultado=%d, Probabilidade=%.4f, Tempo=%.2fms",
+                    resultado, prob_fraude, processing_time)
         
         # Resposta estruturada
         response = {
             'resultado': {
-                'fraude': int(resultado),
-                'probabilidade_fraude': round(float(prob_fraude), 4),
-                'probabilidade_normal': round(float(probabilidades[0]), 4),
+                'fraude': resultado,
+                'probabilidade_fraude': round(prob_fraude, 4),
+                'probabilidade_normal': round(1.0 - prob_fraude, 4),
                 'status': 'FRAUDE' if resultado == 1 else 'NORMAL',
                 'nivel_risco': risk_level
             },
             'metadados': {
-                'timestamp': start_time.isoformat(),
+                'timestamp': timestamp,
                 'processing_time_ms': round(processing_time, 2),
                 'modelo_tipo': model_manager.metadata.get('modelo_tipo', 'N/A'),
-                'versao_api': '2.0.0'
+                'versao_api': API_VERSION
             },
             'recomendacao': {
                 'acao': 'BLOQUEAR' if resultado == 1 else 'APROVAR',
-                'confianca': 'ALTA' if abs(prob_fraude - 0.5) > 0.3 else 'MEDIA'
+                'confianca': _CONFIANCA_LABELS[bisect.bisect_right(_CONFIANCA_BINS, prob_fraude)]
             }
         }
         
-        return jsonify(response), 200
-        
-    except KeyError as e:
-        error_msg = f'Campo obrigatório não encontrado: {str(e)}'
-        logger.warning(f"Erro de validação: {error_msg}")
-        return jsonify({
-            'erro': error_msg,
-            'status': 'VALIDATION_ERROR',
-            'timestamp': start_time.isoformat()
-        }), 400
+        return ojsonify(response), 200
         
     except Exception as e:
         error_msg = f'Erro interno do servidor: {str(e)}'
-        logger.error(f"Erro na predição: {error_msg}")
-        return jsonify({
+        logger.error("Erro na predição: %s", error_msg)
+        return ojsonify({
             'erro': error_msg,
             'status': 'INTERNAL_ERROR',
-            'timestamp': start_time.isoformat()
+            'timestamp': timestamp
         }), 500
 
 # =============================================================================
@@ -557,25 +1016,24 @@ def _execute_test(dados_teste: Dict, descricao: str):
     """Executa teste com dados fornecidos"""
     try:
         if not model_manager.model_loaded:
-            return jsonify({
+            return ojsonify({
                 'erro': 'Modelo não carregado para teste',
                 'status': 'ERROR'
             }), 503
         
         # Preprocessar e predizer
-        entrada = model_manager.preprocess_data(dados_teste)
-        resultado = model_manager.modelo.predict(entrada)[0]
-        probabilidades = model_manager.modelo.predict_proba(entrada)[0]
+        entrada = model_manager.parse_and_featurize(dados_teste)
+        resultado, prob_fraude = model_manager.predict(entrada)
         
-        return jsonify({
+        return ojsonify({
             'teste': {
                 'descricao': descricao,
                 'dados_entrada': dados_teste
             },
             'resultado': {
-                'fraude': int(resultado),
-                'probabilidade_fraude': round(float(probabilidades[1]), 4),
-                'probabilidade_normal': round(float(probabilidades[0]), 4),
+                'fraude': resultado,
+                'probabilidade_fraude': round(prob_fraude, 4),
+                'probabilidade_normal': round(1.0 - prob_fraude, 4),
                 'status': 'FRAUDE' if resultado == 1 else 'NORMAL'
             },
             'timestamp': datetime.now().isoformat()
@@ -583,7 +1041,7 @@ def _execute_test(dados_teste: Dict, descricao: str):
         
     except Exception as e:
         logger.error(f"Erro no teste: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'erro': f'Erro durante o teste: {str(e)}',
             'status': 'TEST_ERROR'
         }), 500
@@ -592,16 +1050,27 @@ def _execute_test(dados_teste: Dict, descricao: str):
 # 📊 ROTA DE INFORMAÇÕES DO MODELO
 # =============================================================================
 
+# Corpo do /info serializado uma única vez (o conteúdo só muda com o modelo)
+_info_body = None
+
 @app.route('/info')
 def model_info():
     """Retorna informações detalhadas sobre o modelo"""
+    global _info_body
     if not model_manager.model_loaded:
-        return jsonify({
+        return ojsonify({
             'erro': 'Modelo não carregado',
             'status': 'ERROR'
         }), 503
     
+    not_modified = _not_modified()
+    if not_modified is not None:
+        return not_modified
+    
     try:
+        if _info_body is not None:
+            return _with_cache_headers(app.response_class(_info_body, mimetype='application/json'))
+        
         info = {
             'modelo': {
                 'tipo': model_manager.metadata.get('modelo_tipo', 'N/A'),
@@ -612,17 +1081,17 @@ def model_info():
             'performance': model_manager.metadata.get('metricas_teste', {}),
             'features': model_manager.feature_names,
             'api': {
-                'versao': '2.0.0',
-                'cors_enabled': CORS_AVAILABLE,
-                'timestamp': datetime.now().isoformat()
+                'versao': API_VERSION,
+                'cors_enabled': CORS_AVAILABLE
             }
         }
         
-        return jsonify(info), 200
+        _info_body = orjson.dumps(info, option=orjson.OPT_SERIALIZE_NUMPY)
+        return _with_cache_headers(app.response_class(_info_body, mimetype='application/json'))
         
     except Exception as e:
         logger.error(f"Erro ao obter informações: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'erro': f'Erro ao obter informações: {str(e)}',
             'status': 'ERROR'
         }), 500
@@ -633,16 +1102,16 @@ def model_info():
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
+    return ojsonify({
         'erro': 'Endpoint não encontrado',
         'status': 'NOT_FOUND',
-        'endpoints_disponiveis': ['/', '/health', '/predict', '/test', '/test/fraud', '/info'],
+        'endpoints_disponiveis': ENDPOINTS_DISPONIVEIS,
         'timestamp': datetime.now().isoformat()
     }), 404
 
 @app.errorhandler(405)
 def method_not_allowed(error):
-    return jsonify({
+    return ojsonify({
         'erro': 'Método HTTP não permitido',
         'status': 'METHOD_NOT_ALLOWED',
         'timestamp': datetime.now().isoformat()
@@ -650,7 +1119,7 @@ def method_not_allowed(error):
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
+    return ojsonify({
         'erro': 'Erro interno do servidor',
         'status': 'INTERNAL_ERROR',
         'timestamp': datetime.now().isoformat()
@@ -690,6 +1159,44 @@ def initialize_app():
     print("  📊 Info Modelo: http://127.0.0.1:5000/info")
     print("\n" + "="*60)
 
+# Intervalo entre as predições de teste usadas pelo /health
+HEALTH_PROBE_INTERVAL_S = 30
+_probe_thread = None
+
+def _probe_loop():
+    """Atualiza periodicamente o status do modelo exibido no /health"""
+    while True:
+        model_manager.probe()
+        time.sleep(HEALTH_PROBE_INTERVAL_S)
+
+def start_background_workers():
+    """Inicia as threads de segundo plano do processo atual"""
+    global _probe_thread
+    # Threads não sobrevivem ao fork: sob o Gunicorn, chamada em cada worker (post_fork)
+    start_log_listener()
+    if model_manager.model_loaded:
+        batch_predictor.start()
+        if _probe_thread is None or not _probe_thread.is_alive():
+            _probe_thread = threading.Thread(target=_probe_loop, name='health-probe', daemon=True)
+            _probe_thread.start()
+
+# Sob o Gunicorn com --preload, os modelos são carregados uma única vez no processo
+# mestre e as páginas de memória são compartilhadas (copy-on-write) entre os workers
+if os.environ.get('GUNICORN_PRELOAD'):
+    initialize_app()
+
 if __name__ == '__main__':
+    import sys
+    
+    # Exportar artefatos para formatos nativos: python api_fraude.py --exportar-artefatos
+    if '--exportar-artefatos' in sys.argv:
+        if not model_manager.load_models():
+            sys.exit(1)
+        for path in model_manager.export_artifacts():
+            print(f"💾 Artefato exportado: {path}")
+        sys.exit(0)
+    
+    # Servidor de desenvolvimento (em produção, usar o Gunicorn: gunicorn -c api/gunicorn.conf.py)
     initialize_app()
+    start_background_workers()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+⚙️ Configuração do Gunicorn para a API de Detecção de Fraudes
+=============================================================
+
+Uso (a partir da raiz do projeto):
+    gunicorn -c api/gunicorn.conf.py
+"""
+
+import multiprocessing
+import os
+
+# Carregar a aplicação (e os modelos) no processo mestre antes do fork
+os.environ.setdefault('GUNICORN_PRELOAD', '1')
+# Threads por worker, também usadas como tamanho máximo do lote de predições
+os.environ.setdefault('GUNICORN_THREADS', '8')
+
+wsgi_app = 'api_fraude:app'
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Workers com threads: várias requisições por processo
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ['GUNICORN_THREADS'])
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Reinicia as threads de segundo plano em cada worker"""
+    import api_fraude
+    # O lote nunca passa do número de requisições simultâneas do worker (--threads)
+    api_fraude.batch_predictor.max_batch = server.cfg.threads
+    api_fraude.start_background_workers()